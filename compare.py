@@ -0,0 +1,95 @@
+import contextlib
+import os
+from multiprocessing import Pool
+from game_master import GameMaster
+from game_stats import GameStats
+from lexicon import create_word_list, determine_word_scores, get_alphabet
+from player import Player
+from seeding import game_seed
+from strategies import get_strategy
+
+# Number of games handed to a worker at a time
+CHUNK_SIZE = 50
+
+
+def _init_lexicon(scoring_method: int):
+    """
+    Sets up the lexicon shared by all GameMaster instances in this process.
+    """
+    GameMaster.word_list = create_word_list()
+    GameMaster.word_scores = determine_word_scores(GameMaster.word_list, scoring_method)
+    GameMaster.scoring_method = scoring_method
+    GameMaster.alphabet = get_alphabet()
+
+
+def _run_chunk(task: tuple) -> tuple:
+    """
+    Plays games [first_game, last_game) of a run with one strategy. Runs in a worker process.
+    :param task: tuple containing (strategy name, run seed, first game, last game)
+    :return: tuple containing (strategy name, GameStats for the games)
+    """
+    strategy_name, seed, first_game, last_game = task
+    player = Player(GameMaster(), False, get_strategy(strategy_name))
+    player.stats = GameStats(seed)
+    # The player narrates every turn, which is just noise here
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for g in range(first_game, last_game):
+            this_game_seed = game_seed(seed, g)
+            outcome_code = player.play_game(this_game_seed)
+            player.record_game(outcome_code, this_game_seed)
+    return strategy_name, player.stats
+
+
+def compare_strategies(strategy_names: list, game_count: int, scoring_method: int, seed: int,
+                       workers: int = 1) -> dict:
+    """
+    Plays the same set of games with each strategy. Game n has the same seed, and so the same
+    answer, for every strategy, and the results don't depend on how many workers are used.
+    :param strategy_names: names of the strategies to compare
+    :param game_count: number of games each strategy plays
+    :param scoring_method: word scoring method, see lexicon.determine_word_scores()
+    :param seed: the run seed
+    :param workers: number of processes to spread the games across
+    :return: dictionary mapping strategy name to GameStats
+    """
+    # Fail early on a bad name, rather than in a worker
+    for name in strategy_names:
+        get_strategy(name)
+
+    tasks = []
+    for name in strategy_names:
+        for first_game in range(0, game_count, CHUNK_SIZE):
+            tasks.append((name, seed, first_game, min(first_game + CHUNK_SIZE, game_count)))
+
+    results = {name: GameStats(seed) for name in strategy_names}
+    if workers > 1:
+        with Pool(workers, initializer=_init_lexicon, initargs=(scoring_method,)) as pool:
+            for name, stats in pool.imap_unordered(_run_chunk, tasks):
+                results[name].merge(stats)
+    else:
+        _init_lexicon(scoring_method)
+        for task in tasks:
+            name, stats = _run_chunk(task)
+            results[name].merge(stats)
+    # Chunks finish in any order
+    for stats in results.values():
+        stats.lost_game_seeds.sort()
+    return results
+
+
+def print_comparison(results: dict):
+    """
+    Prints the results of compare_strategies() side by side.
+    """
+    print(f"\n{'strategy':<16}{'games':>8}{'win %':>8}{'guesses':>9}{'mean ms':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for name, stats in results.items():
+        win_rate = stats.win_rate()
+        mean_guesses = stats.mean_guesses()
+        move_time = stats.move_time()
+        columns = [
+            "-" if win_rate is None else f"{win_rate * 100.0:.2f}",
+            "-" if mean_guesses is None else f"{mean_guesses:.3f}",
+        ]
+        for value in (move_time.mean(), move_time.quantile(0.5), move_time.quantile(0.99)):
+            columns.append("-" if value is None else f"{value * 1000.0:.3f}")
+        print(f"{name:<16}{stats.games:>8}{columns[0]:>8}{columns[1]:>9}{columns[2]:>9}{columns[3]:>9}{columns[4]:>9}")
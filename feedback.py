@@ -0,0 +1,173 @@
+"""
+Computes feedback for many (guess, answer) pairs at once with NumPy, following the same rules as
+GameMaster.handle_guess(): greens first, then yellows from left to right, with each letter in the
+answer able to turn only one guess letter green or yellow.
+
+Words are encoded as rows of five letter numbers (a=0 ... z=25). Feedback is encoded as a single
+pattern code: the sum of color * 3^position, with gray = 0, yellow = 1 and green = 2. That gives
+codes from 0 (all gray) to 242 (all green), which fit in a uint8.
+"""
+
+import numpy as np
+from game_master import GameMaster
+from game_stats import feedback_pattern
+
+GRAY = 0
+YELLOW = 1
+GREEN = 2
+ALL_GREEN = 242
+
+_POWERS = np.array([1, 3, 9, 27, 81], dtype=np.uint8)
+# _EARLIER[i, j] is True when position j comes before position i
+_EARLIER = np.tril(np.ones((5, 5), dtype=bool), k=-1)
+# Upper limit on the number of (guess, answer) pairs worked on at once, to bound memory use
+_BLOCK_PAIRS = 1 << 20
+
+
+def encode_words(words) -> np.ndarray:
+    """
+    Encodes a list of five-letter words. Case doesn't matter.
+    :param words: the words
+    :return: uint8 array of shape (number of words, 5)
+    :raises ValueError: if a word isn't five letters from a to z
+    """
+    lowered = []
+    for word in words:
+        word = word.lower()
+        if len(word) != 5 or not (word.isascii() and word.isalpha()):
+            raise ValueError(f"Not a five-letter word: {word!r}")
+        lowered.append(word)
+    joined = "".join(lowered).encode("ascii")
+    codes = np.frombuffer(joined, dtype=np.uint8) - ord("a")
+    return codes.reshape(len(lowered), 5)
+
+
+def _letter_counts(words: np.ndarray) -> np.ndarray:
+    """
+    :return: array of shape (number of words, 26) with the number of times each letter appears in each word
+    """
+    return np.sum(words[:, :, None] == np.arange(26, dtype=np.uint8), axis=1, dtype=np.uint8)
+
+
+def _guess_tables(guesses: np.ndarray):
+    """
+    Precomputes what the yellow rule needs to know about each guess on its own.
+    :return: tuple containing (array of shape (G, 5, 5) where [g, i, j] is 1 when guess letter j is
+    the same letter as guess letter i and isn't before it, array of shape (G, 5) with the number
+    of earlier letters in the guess that are the same letter as letter i)
+    """
+    same = guesses[:, :, None] == guesses[:, None, :]
+    same_earlier = same & _EARLIER
+    return (same & ~same_earlier).astype(np.float32), np.sum(same_earlier, axis=-1, dtype=np.int16)
+
+
+def _patterns(green: np.ndarray, available: np.ndarray, not_before: np.ndarray) -> np.ndarray:
+    """
+    Applies the yellow rule and turns colors into pattern codes.
+
+    Going left to right, guess letter i is yellow if it isn't green and the answer still has a copy
+    of the letter that hasn't been used. Copies get used by greens anywhere in the guess, and by
+    yellows earlier in the guess. Every earlier non-green copy in the guess became yellow while
+    copies lasted, so letter i is yellow when
+        (greens of the letter at or after i) + (earlier copies of the letter) < (copies in answer)
+
+    :param green: bool array (..., 5)
+    :param available: copies in the answer of each guess letter, minus earlier copies of it in
+    the guess, shape (..., 5)
+    :param not_before: the first table from _guess_tables(), broadcastable against green
+    """
+    greens_at_or_after = np.matmul(green.astype(np.float32), np.swapaxes(not_before, -1, -2))
+    yellow = ~green & (greens_at_or_after < available)
+    colors = green.astype(np.uint8) * GREEN + yellow.astype(np.uint8)
+    return colors @ _POWERS
+
+
+def feedback_pairwise(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """
+    Computes feedback for guesses[n] against answers[n], for every n.
+    :param guesses: encoded guesses, shape (N, 5)
+    :param answers: encoded answers, shape (N, 5)
+    :return: uint8 array of pattern codes, shape (N,)
+    """
+    guesses = np.asarray(guesses, dtype=np.uint8)
+    answers = np.asarray(answers, dtype=np.uint8)
+    if guesses.shape != answers.shape:
+        raise ValueError(f"Shapes {guesses.shape} and {answers.shape} don't match")
+    result = np.empty(len(guesses), dtype=np.uint8)
+    for start in range(0, len(guesses), _BLOCK_PAIRS):
+        stop = start + _BLOCK_PAIRS
+        block_guesses = guesses[start:stop]
+        block_answers = answers[start:stop]
+        not_before, earlier_copies = _guess_tables(block_guesses)
+        counts = _letter_counts(block_answers)
+        available = np.take_along_axis(counts, block_guesses.astype(np.intp), axis=1) - earlier_copies
+        green = block_guesses == block_answers
+        result[start:stop] = _patterns(green[:, None, :], available[:, None, :], not_before)[:, 0]
+    return result
+
+
+def feedback_table(guesses: np.ndarray, answers: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Computes feedback for every guess against every answer.
+    :param guesses: encoded guesses, shape (G, 5)
+    :param answers: encoded answers, shape (A, 5)
+    :param out: optional array of shape (G, A) to write into, e.g. a memory-mapped file
+    :return: uint8 array of pattern codes, shape (G, A), where [g, a] is the feedback for
+    guess g against answer a
+    """
+    guesses = np.asarray(guesses, dtype=np.uint8)
+    answers = np.asarray(answers, dtype=np.uint8)
+    if out is None:
+        out = np.empty((len(guesses), len(answers)), dtype=np.uint8)
+    not_before, earlier_copies = _guess_tables(guesses)
+    # Transposed so that gathering by guess letter gives rows of answers
+    counts = _letter_counts(answers).T.astype(np.int16)
+    block_rows = max(1, _BLOCK_PAIRS // max(1, len(answers)))
+    for start in range(0, len(guesses), block_rows):
+        stop = start + block_rows
+        block_guesses = guesses[start:stop]
+        green = block_guesses[:, None, :] == answers[None, :, :]
+        # counts[letter] is a row over answers, so this is (rows, 5, A), swapped to (rows, A, 5)
+        available = np.swapaxes(counts[block_guesses], 1, 2) - earlier_copies[start:stop, None, :]
+        out[start:stop] = _patterns(green, available, not_before[start:stop])
+    return out
+
+
+def pattern_to_string(code: int) -> str:
+    """
+    Converts a pattern code into the string form used by game_stats.feedback_pattern(), e.g. "-yg--"
+    """
+    pattern = ""
+    for i in range(5):
+        pattern += "-yg"[code % 3]
+        code //= 3
+    return pattern
+
+
+def check_against_game_master(word_list: list, answers: list = None) -> int:
+    """
+    Checks feedback_table() against GameMaster.handle_guess(), for every word in word_list as a
+    guess against every answer.
+    :param word_list: the guesses
+    :param answers: the answers; all of word_list if not given
+    :return: number of mismatches found
+    """
+    if answers is None:
+        answers = word_list
+    table = feedback_table(encode_words(word_list), encode_words(answers))
+    game_master = GameMaster()
+    game_master.allow_non_words = True
+    mismatches = 0
+    for a, answer in enumerate(answers):
+        game_master.correct_word = answer
+        row = table[:, a]
+        for g, guess in enumerate(word_list):
+            # The letter lists don't depend on anything tracked between guesses
+            success, gray_letters, yellow_letters, green_letters = game_master.handle_guess(guess)
+            expected = feedback_pattern(gray_letters, yellow_letters, green_letters)
+            if pattern_to_string(int(row[g])) != expected:
+                if mismatches < 10:
+                    print(f"Mismatch: guess {guess}, answer {answer}, "
+                          f"expected {expected}, got {pattern_to_string(int(row[g]))}")
+                mismatches += 1
+    return mismatches
@@ -1,6 +1,7 @@
-from random import randrange
+from random import Random
 from typing import Tuple, Optional
-from lexicon import to_string
+from lexicon import to_string, LetterFrequencies
+from seeding import make_rng
 
 class GameMaster:
     """
@@ -9,8 +10,16 @@ class GameMaster:
     word_list = []
     word_scores = {}
     alphabet = []
+    scoring_method = 1
+    # Letter counts over the whole word list, built when first needed, and the list they were
+    # built from, so they get rebuilt if word_list is replaced
+    letter_frequencies = None
+    letter_frequencies_source = None
 
-    def __init__(self):
+    def __init__(self, rng: Optional[Random] = None):
+        # Every random choice this class makes goes through its own generator, so that a game
+        # can be replayed exactly by reseeding it (see reset())
+        self.rng = rng if rng is not None else make_rng()
         self.guesses_left = 0
         self.total_guesses = 0
         self.correct_word = None
@@ -20,13 +29,20 @@ class GameMaster:
         self.misplaced_letters = None
         self.misplaced_letter_count = None
         self.misplaced_letter_map = None
+        self.candidates = None
+        self.candidate_frequencies = None
+        self.candidates_stale = False
         self.reset()
         self.allow_non_words = False
 
-    def reset(self):
+    def reset(self, seed: Optional[int] = None):
         """
         Call before starting a new game, to reset data.
+        :param seed: if provided, the random number generator is reseeded with it first, making
+        the answer word and all later random choices in the game reproducible
         """
+        if seed is not None:
+            self.rng.seed(seed)
         self.guesses_left = self.total_guesses = 6
         self.correct_word = self.choose_random_word()
         self.last_guess = None
@@ -42,6 +58,11 @@ class GameMaster:
         for c in self.alphabet:
             self.misplaced_letter_count[c] = 0
             self.misplaced_letter_map[c] = [False for i in range(5)]
+        # Words that could still be the answer, and their letter counts. These are only brought
+        # up to date when live scores are asked for, see get_live_frequencies().
+        self.candidates = self.word_list
+        self.candidate_frequencies = None
+        self.candidates_stale = False
 
     def choose_random_word(self) -> Optional[str]:
         """
@@ -53,7 +74,7 @@ class GameMaster:
             return None
         word = None
         for n in range(100):
-            word = self.word_list[randrange(word_list_size)]
+            word = self.word_list[self.rng.randrange(word_list_size)]
             if word[4] != 's':
                 break
         return word
@@ -165,6 +186,7 @@ class GameMaster:
 
         self.guesses_left -= 1
         self.last_guess = guess
+        self.candidates_stale = True
         return True, gray_letters, yellow_letters, green_letters
 
     def get_all_yellow_patterns(self):
@@ -193,7 +215,7 @@ class GameMaster:
         usable_words = self.get_usable_words()
         print(f"There are {len(usable_words)} valid choices")
         if len(usable_words) > 5:
-            hint = usable_words[randrange(len(usable_words))]
+            hint = usable_words[self.rng.randrange(len(usable_words))]
             print(f"Hint word is: {hint}")
 
     def print_data(self):
@@ -232,52 +254,32 @@ class GameMaster:
             usable_words = []
 
         for word in self.word_list:
-            keep = True
-            # Eliminate words with unusable letters or letters that don't align with "definite" letters
-            for i, c in enumerate(word):
-                if (not ignore_greens) and (self.definite_letters[i] is not None) and (self.definite_letters[i] != c):
-                    keep = False
-                    break
-                if c in self.eliminated_letters:
-                    if c not in self.definite_letters:
-                        keep = False
-                        break
-
-            # Make sure misplaced letters are present in reasonable places
-            if not ignore_yellows:
-                for let in self.misplaced_letters:
-                    if let in word:
-                        # Letter is in the word, but is it an untried slot?
-                        found_slot = False
-                        pos_list = self.misplaced_letter_map.get(let)
-                        for i, tried in enumerate(pos_list):
-                            if not tried and word[i] == let:
-                                found_slot = True
-                                break
-                        if not found_slot:
-                            keep = False
-                            break
-                    else:
-                        keep = False
-                        break
-            if keep and word != self.last_guess:
+            if self._is_usable(word, ignore_greens, ignore_yellows) and word != self.last_guess:
                 usable_words.append(word)
         return usable_words
 
-    def select_usable_word(self, usable_words: list, score_above: float = 95.0):
+    def select_usable_word(self, usable_words: list, score_above: float = 95.0, live_scores: bool = False):
         """
         Given a set of usable words, select one at random. We want one whose score is
         higher than score_above, if possible, but we'll take the highest scoring one.
         :param usable_words: list of usable words
         :param score_above: score to exceed (a percentage)
-        :return: the chosen word
+        :param live_scores: if True, words are scored by the letters of the words that could still be
+        the answer, rather than of the whole lexicon. Scores are then percentages of the range
+        of scores among the usable words.
+        :return: the chosen word, or None if usable_words is empty
         """
+        if len(usable_words) == 0:
+            return None
+        word_scores = self.word_scores
+        if live_scores:
+            word_scores = self._get_live_scores(usable_words)
         high_scoring_words = []
 
         best_word = None
         best_score = -1.0
         for word in usable_words:
-            score = self.word_scores[word]
+            score = word_scores[word]
             if score > best_score:
                 best_score = score
                 best_word = word
@@ -287,9 +289,92 @@ class GameMaster:
         if len(high_scoring_words) == 0:
             return best_word
 
-        idx = randrange(len(high_scoring_words))
+        idx = self.rng.randrange(len(high_scoring_words))
         return high_scoring_words[idx]
 
+    def _get_live_scores(self, usable_words: list) -> dict:
+        """
+        Scores usable words by the current candidates' letter counts, as percentages like those
+        from determine_word_scores().
+        """
+        frequencies = self.get_live_frequencies()
+        raw_scores = {}
+        for word in usable_words:
+            raw_scores[word] = frequencies.score(word, self.scoring_method)
+        lowest_score = min(raw_scores.values())
+        highest_score = max(raw_scores.values())
+        if highest_score == lowest_score:
+            return dict.fromkeys(usable_words, 100.0)
+        word_scores = {}
+        for word, score in raw_scores.items():
+            word_scores[word] = float(score - lowest_score) * 100.0 / float(highest_score - lowest_score)
+        return word_scores
+
+    def _is_usable(self, word: str, ignore_greens: bool = False, ignore_yellows: bool = False) -> bool:
+        """
+        Checks one word against the successfully placed, misplaced, and eliminated letters.
+        See get_usable_words() for the parameters.
+        """
+        # Eliminate words with unusable letters or letters that don't align with "definite" letters
+        for i, c in enumerate(word):
+            if (not ignore_greens) and (self.definite_letters[i] is not None) and (self.definite_letters[i] != c):
+                return False
+            if c in self.eliminated_letters:
+                if c not in self.definite_letters:
+                    return False
+
+        # Make sure misplaced letters are present in reasonable places
+        if not ignore_yellows:
+            for let in self.misplaced_letters:
+                if let in word:
+                    # Letter is in the word, but is it an untried slot?
+                    found_slot = False
+                    pos_list = self.misplaced_letter_map.get(let)
+                    for i, tried in enumerate(pos_list):
+                        if not tried and word[i] == let:
+                            found_slot = True
+                            break
+                    if not found_slot:
+                        return False
+                else:
+                    return False
+        return True
+
+    def get_live_frequencies(self) -> LetterFrequencies:
+        """
+        Returns letter counts over the words that could still be the answer. The counts carry over
+        from the last call. Each update checks every word that was a candidate at the last call, so
+        it costs time proportional to the previous candidate set, which shrinks every turn. Only the
+        counts of the words eliminated since then are subtracted. (When most of the candidates were
+        just eliminated, it's cheaper to count the survivors from scratch, so that happens instead.)
+        :return: the counts
+        """
+        if self.candidate_frequencies is None:
+            # Until the first update, candidates is the word list this game started with
+            if GameMaster.letter_frequencies_source is not self.candidates:
+                GameMaster.letter_frequencies = LetterFrequencies(self.candidates)
+                GameMaster.letter_frequencies_source = self.candidates
+            self.candidate_frequencies = GameMaster.letter_frequencies.copy()
+        if self.candidates_stale:
+            # Constraints tighten as the game goes on, so only the previous candidates need checking.
+            # (The misplaced letter bookkeeping can loosen a little when a yellow turns green, but
+            # that only lets back in words that an earlier guess already ruled out.)
+            remaining = []
+            eliminated = []
+            for word in self.candidates:
+                if self._is_usable(word) and word != self.last_guess:
+                    remaining.append(word)
+                else:
+                    eliminated.append(word)
+            if len(eliminated) > len(remaining):
+                self.candidate_frequencies = LetterFrequencies(remaining)
+            else:
+                for word in eliminated:
+                    self.candidate_frequencies.remove(word)
+            self.candidates = remaining
+            self.candidates_stale = False
+        return self.candidate_frequencies
+
     def _count_possible_slots_for_misplaced_letter(self, letter):
         """
         Returns count of number of slots in which letter can still be placed.
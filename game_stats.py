@@ -0,0 +1,326 @@
+import csv
+import json
+import math
+from collections import Counter
+from typing import Optional
+
+
+def feedback_pattern(gray_letters: list, yellow_letters: list, green_letters: list) -> str:
+    """
+    Condenses the lists returned by GameMaster.handle_guess() into a five-character string,
+    with 'g' for green, 'y' for yellow and '-' for gray, e.g. "-yg--"
+    :return: the pattern string
+    """
+    pattern = ""
+    for i in range(5):
+        if green_letters[i] is not None:
+            pattern += "g"
+        elif yellow_letters[i] is not None:
+            pattern += "y"
+        else:
+            pattern += "-"
+    return pattern
+
+
+class QuantileSketch:
+    """
+    Estimates quantiles of a stream of non-negative numbers without keeping the numbers. Values
+    are counted in logarithmically sized buckets, so any quantile comes back within a fixed
+    relative error (1% by default) of the true value, and memory grows only with the log of the
+    range of values seen. Two sketches with the same accuracy can be merged.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        # Maps bucket index to count. Bucket i holds values in (gamma^(i-1), gamma^i]
+        self.buckets = {}
+        # Values too small to take a log of are counted separately
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min_value = None
+        self.max_value = None
+
+    def add(self, value: float):
+        if value <= 1e-12:
+            self.zero_count += 1
+        else:
+            idx = int(math.ceil(math.log(value) / self.log_gamma))
+            self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+
+    def merge(self, other: "QuantileSketch"):
+        """
+        Adds the contents of another sketch to this one.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Can't merge sketches with different accuracies")
+        for idx, count in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min_value, other.max_value):
+            if value is not None:
+                if self.min_value is None or value < self.min_value:
+                    self.min_value = value
+                if self.max_value is None or value > self.max_value:
+                    self.max_value = value
+
+    def mean(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Returns the estimated value at quantile q (0.5 for the median, etc)
+        :param q: the quantile, between 0 and 1
+        :return: the estimate, or None if nothing was added
+        """
+        if self.count == 0:
+            return None
+        if q <= 0.0:
+            return self.min_value
+        if q >= 1.0:
+            return self.max_value
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if rank < seen:
+                # Middle of the bucket, which is what gives the relative error guarantee
+                estimate = 2.0 * math.pow(self.gamma, idx) / (self.gamma + 1.0)
+                return min(max(estimate, self.min_value), self.max_value)
+        return self.max_value
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "min": self.min_value,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max_value,
+        }
+
+
+class PhaseStats:
+    """
+    Running totals for all turns played with one phase of a strategy.
+    """
+
+    def __init__(self):
+        self.turns = 0
+        self.solved = 0
+        # Seconds spent choosing and scoring the guess
+        self.time = QuantileSketch()
+        self.candidates_before = QuantileSketch()
+        self.candidates_after = QuantileSketch()
+        # Fraction of candidates remaining after the turn; lower is better
+        self.remaining_fraction = QuantileSketch()
+        self.patterns = Counter()
+
+    def merge(self, other: "PhaseStats"):
+        self.turns += other.turns
+        self.solved += other.solved
+        self.time.merge(other.time)
+        self.candidates_before.merge(other.candidates_before)
+        self.candidates_after.merge(other.candidates_after)
+        self.remaining_fraction.merge(other.remaining_fraction)
+        self.patterns.update(other.patterns)
+
+    def to_dict(self) -> dict:
+        return {
+            "turns": self.turns,
+            "solved": self.solved,
+            "time_seconds": self.time.to_dict(),
+            "candidates_before": self.candidates_before.to_dict(),
+            "candidates_after": self.candidates_after.to_dict(),
+            "remaining_fraction": self.remaining_fraction.to_dict(),
+            "patterns": dict(self.patterns.most_common()),
+        }
+
+
+class GameStats:
+    """
+    Collects statistics over many games, turn by turn. Everything is aggregated as it arrives
+    (counters and quantile sketches), so apart from the seeds of lost games, memory use doesn't
+    grow with the number of games played. Collectors from separate runs can be merged.
+    """
+
+    def __init__(self, run_seed: Optional[int] = None):
+        """
+        :param run_seed: seed of the run being recorded, written out with the results so the run
+        can be repeated
+        """
+        self.run_seed = run_seed
+        # Seeds of games that weren't won, so they can be replayed one at a time
+        self.lost_game_seeds = []
+        self.games = 0
+        self.outcomes = Counter()
+        # Maps number of guesses to number of games won with that many guesses
+        self.guess_histogram = Counter()
+        # Maps strategy phase to PhaseStats
+        self.phases = {}
+        # Maps (turn number, phase) to number of times that phase was used on that turn
+        self.phase_by_turn = Counter()
+
+    def record_turn(self, phase: str, turn: int, candidates_before: int, candidates_after: int,
+                    seconds: float, pattern: str):
+        """
+        Records a single turn.
+        :param phase: name of the strategy phase that picked the guess
+        :param turn: the turn number, starting at 1
+        :param candidates_before: number of possible answers before the guess
+        :param candidates_after: number of possible answers after the guess (1 if it was right)
+        :param seconds: time spent on the turn
+        :param pattern: the feedback pattern, see feedback_pattern()
+        """
+        phase_stats = self.phases.get(phase)
+        if phase_stats is None:
+            phase_stats = PhaseStats()
+            self.phases[phase] = phase_stats
+        phase_stats.turns += 1
+        if pattern == "ggggg":
+            phase_stats.solved += 1
+        phase_stats.time.add(seconds)
+        phase_stats.candidates_before.add(candidates_before)
+        phase_stats.candidates_after.add(candidates_after)
+        if candidates_before > 0:
+            phase_stats.remaining_fraction.add(float(candidates_after) / float(candidates_before))
+        phase_stats.patterns[pattern] += 1
+        self.phase_by_turn[(turn, phase)] += 1
+
+    def record_game(self, outcome: str, score: int, seed: Optional[int] = None):
+        """
+        Records the end of a game.
+        :param outcome: name of the outcome, e.g. "VICTORY"
+        :param score: number of guesses used
+        :param seed: the game's seed, kept if the game was lost
+        """
+        self.games += 1
+        self.outcomes[outcome] += 1
+        if outcome == "VICTORY":
+            self.guess_histogram[score] += 1
+        elif seed is not None:
+            self.lost_game_seeds.append(seed)
+
+    def merge(self, other: "GameStats"):
+        """
+        Adds the contents of another collector to this one.
+        """
+        if self.run_seed is None:
+            self.run_seed = other.run_seed
+        self.lost_game_seeds.extend(other.lost_game_seeds)
+        self.games += other.games
+        self.outcomes.update(other.outcomes)
+        self.guess_histogram.update(other.guess_histogram)
+        for phase, phase_stats in other.phases.items():
+            if phase not in self.phases:
+                self.phases[phase] = PhaseStats()
+            self.phases[phase].merge(phase_stats)
+        self.phase_by_turn.update(other.phase_by_turn)
+
+    def win_rate(self) -> Optional[float]:
+        """
+        :return: fraction of games won, or None if no games were recorded
+        """
+        if self.games == 0:
+            return None
+        return float(self.outcomes["VICTORY"]) / float(self.games)
+
+    def mean_guesses(self) -> Optional[float]:
+        """
+        :return: average number of guesses in games that were won, or None if none were
+        """
+        wins = sum(self.guess_histogram.values())
+        if wins == 0:
+            return None
+        return float(sum(k * v for k, v in self.guess_histogram.items())) / float(wins)
+
+    def move_time(self) -> QuantileSketch:
+        """
+        :return: a sketch of the time taken by every turn, whatever the phase
+        """
+        sketch = QuantileSketch()
+        for phase_stats in self.phases.values():
+            sketch.merge(phase_stats.time)
+        return sketch
+
+    def to_dict(self) -> dict:
+        return {
+            "run_seed": self.run_seed,
+            "lost_game_seeds": self.lost_game_seeds,
+            "games": self.games,
+            "outcomes": dict(self.outcomes),
+            "guess_histogram": {str(k): v for k, v in sorted(self.guess_histogram.items())},
+            "phases": {phase: phase_stats.to_dict() for phase, phase_stats in self.phases.items()},
+            "phase_by_turn": [{"turn": turn, "phase": phase, "count": count}
+                              for (turn, phase), count in sorted(self.phase_by_turn.items())],
+        }
+
+    def phase_rows(self) -> list:
+        """
+        Returns one flat row (a dictionary) per phase, for tables and CSV files.
+        """
+        rows = []
+        for phase, phase_stats in self.phases.items():
+            rows.append({
+                "phase": phase,
+                "turns": phase_stats.turns,
+                "solved": phase_stats.solved,
+                "mean_ms": _scaled(phase_stats.time.mean(), 1000.0),
+                "p50_ms": _scaled(phase_stats.time.quantile(0.5), 1000.0),
+                "p99_ms": _scaled(phase_stats.time.quantile(0.99), 1000.0),
+                "mean_before": phase_stats.candidates_before.mean(),
+                "mean_after": phase_stats.candidates_after.mean(),
+                "p50_after": phase_stats.candidates_after.quantile(0.5),
+                "mean_remaining": phase_stats.remaining_fraction.mean(),
+            })
+        return rows
+
+    def write_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_csv(self, path: str):
+        rows = self.phase_rows()
+        if len(rows) == 0:
+            return
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def print_summary(self):
+        print("\nPer-phase statistics:")
+        print(f"{'phase':<18}{'turns':>8}{'solved':>8}{'mean ms':>10}{'p99 ms':>10}"
+              f"{'before':>10}{'after':>10}{'remaining':>11}")
+        for row in self.phase_rows():
+            print(f"{row['phase']:<18}{row['turns']:>8}{row['solved']:>8}{_fmt(row['mean_ms']):>10}"
+                  f"{_fmt(row['p99_ms']):>10}{_fmt(row['mean_before']):>10}{_fmt(row['mean_after']):>10}"
+                  f"{_fmt(row['mean_remaining']):>11}")
+        print("Guesses per victory:", _histogram_string(self.guess_histogram))
+
+
+def _histogram_string(histogram: Counter) -> str:
+    return ", ".join(f"{k}: {v}" for k, v in sorted(histogram.items()))
+
+
+def _scaled(value: Optional[float], factor: float) -> Optional[float]:
+    return None if value is None else value * factor
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
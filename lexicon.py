@@ -154,6 +154,58 @@ def determine_word_scores(word_list: list, scoring_method) -> dict:
 
     return new_score_dict
 
+class LetterFrequencies:
+    """
+    Counts of letters over a set of words, both per position (as in scoring method 1) and overall
+    (as in scoring method 2). Words can be added and removed one at a time, so the counts can
+    follow a shrinking set of candidate words without being rebuilt.
+    """
+
+    def __init__(self, word_list: list = None):
+        alphabet = get_alphabet()
+        # A list of dictionaries of {letter: count}, one for each position
+        self.position_counts = [dict.fromkeys(alphabet, 0) for i in range(5)]
+        # A dictionary mapping letter to count, ignoring position
+        self.letter_counts = dict.fromkeys(alphabet, 0)
+        self.word_count = 0
+        if word_list is not None:
+            for word in word_list:
+                self.add(word)
+
+    def add(self, word: str):
+        for i, c in enumerate(word):
+            self.position_counts[i][c] += 1
+            self.letter_counts[c] += 1
+        self.word_count += 1
+
+    def remove(self, word: str):
+        for i, c in enumerate(word):
+            self.position_counts[i][c] -= 1
+            self.letter_counts[c] -= 1
+        self.word_count -= 1
+
+    def copy(self) -> "LetterFrequencies":
+        other = LetterFrequencies()
+        other.position_counts = [counts.copy() for counts in self.position_counts]
+        other.letter_counts = self.letter_counts.copy()
+        other.word_count = self.word_count
+        return other
+
+    def score(self, word: str, scoring_method: int) -> int:
+        """
+        Scores a word against the current counts, the same way as determine_word_scores_1()
+        or determine_word_scores_2(), depending on scoring method.
+        """
+        score = 0
+        if scoring_method == 1:
+            for i, c in enumerate(word):
+                score += self.position_counts[i][c]
+        else:
+            for c in word:
+                score += self.letter_counts[c]
+        return score
+
+
 def to_string(array, commas=False):
     """
     Given an array of strings or single characters, produce a human-readable string
@@ -0,0 +1,161 @@
+"""
+Tables of feedback pattern codes (see feedback.py) for every guess against every answer. Row g,
+column a holds the code for guess g against answer a. Guesses and answers can be different lists,
+so tables can be rectangular.
+
+A full table takes one byte per pair: about 6.7 MB for the 2582-word lexicon, but 170 MB for 13,000
+words and more for bigger lexicons. So tables can be built tile by tile across several processes,
+written straight into a memory-mapped .npy file, or skipped entirely with StreamingPatternTable,
+which computes blocks of rows only when they're asked for.
+"""
+
+from collections import OrderedDict, deque
+from multiprocessing import Pool
+from typing import Optional
+import numpy as np
+from feedback import encode_words, feedback_table
+
+# Encoded words for worker processes, set by _init_worker()
+_worker_guesses = None
+_worker_answers = None
+
+
+def _init_worker(guesses: np.ndarray, answers: np.ndarray):
+    global _worker_guesses, _worker_answers
+    _worker_guesses = guesses
+    _worker_answers = answers
+
+
+def _compute_tile(tile: tuple) -> tuple:
+    """
+    Computes one tile of the table in a worker process.
+    :param tile: tuple containing (first row, last row, first column, last column), end exclusive
+    :return: tuple containing (the tile's position, as passed in, array of codes)
+    """
+    row_start, row_stop, col_start, col_stop = tile
+    codes = feedback_table(_worker_guesses[row_start:row_stop], _worker_answers[col_start:col_stop])
+    return tile, codes
+
+
+def _write_tile(table: np.ndarray, result: tuple):
+    """
+    Copies a tile returned by _compute_tile() into the table.
+    """
+    tile, codes = result
+    table[tile[0]:tile[1], tile[2]:tile[3]] = codes
+
+
+def build_pattern_table(guesses: list, answers: list, path: Optional[str] = None, tile_size: int = 1024,
+                        workers: int = 1) -> np.ndarray:
+    """
+    Builds the table of pattern codes for every guess against every answer.
+    :param guesses: list of guess words
+    :param answers: list of answer words
+    :param path: if given, the table is written to this .npy file as it's built, and returned as a
+    read-only memory map of the file. Otherwise it's built in memory.
+    :param tile_size: the table is computed in square tiles this many words on a side
+    :param workers: number of processes to compute tiles with
+    :return: the table, shape (len(guesses), len(answers)), dtype uint8
+    """
+    encoded_guesses = encode_words(guesses)
+    encoded_answers = encode_words(answers)
+    shape = (len(guesses), len(answers))
+    if path is not None:
+        table = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=shape)
+    else:
+        table = np.empty(shape, dtype=np.uint8)
+
+    tiles = []
+    for row_start in range(0, shape[0], tile_size):
+        for col_start in range(0, shape[1], tile_size):
+            tiles.append((row_start, min(row_start + tile_size, shape[0]),
+                          col_start, min(col_start + tile_size, shape[1])))
+
+    if workers > 1:
+        # Tiles are handed out a window at a time, and each one is written before another is
+        # submitted, so no more than 2 * workers tiles are ever queued or waiting to be written
+        with Pool(workers, initializer=_init_worker, initargs=(encoded_guesses, encoded_answers)) as pool:
+            in_flight = deque()
+            for tile in tiles:
+                if len(in_flight) >= 2 * workers:
+                    _write_tile(table, in_flight.popleft().get())
+                in_flight.append(pool.apply_async(_compute_tile, (tile,)))
+            while len(in_flight) > 0:
+                _write_tile(table, in_flight.popleft().get())
+    else:
+        for row_start, row_stop, col_start, col_stop in tiles:
+            feedback_table(encoded_guesses[row_start:row_stop], encoded_answers[col_start:col_stop],
+                           out=table[row_start:row_stop, col_start:col_stop])
+
+    if path is not None:
+        table.flush()
+        del table
+        return load_pattern_table(path)
+    return table
+
+
+def load_pattern_table(path: str) -> np.ndarray:
+    """
+    Opens a table written by build_pattern_table() as a read-only memory map, so only the parts
+    that get used are read from disk.
+    """
+    return np.load(path, mmap_mode="r")
+
+
+class StreamingPatternTable:
+    """
+    Acts like a pattern table, but computes rows on demand, a block of rows at a time. The most
+    recently used blocks are kept within a fixed byte budget. A block takes block_rows * len(answers)
+    bytes, so a bigger lexicon means fewer cached blocks, not more memory.
+    """
+
+    def __init__(self, guesses: list, answers: list, block_rows: int = 256, max_cache_bytes: int = 32 << 20):
+        """
+        :param guesses: list of guess words
+        :param answers: list of answer words
+        :param block_rows: number of rows computed at once
+        :param max_cache_bytes: memory budget for cached blocks. At least one block is always kept,
+        so if a single block is bigger than the budget, lower block_rows.
+        """
+        self.encoded_guesses = encode_words(guesses)
+        self.encoded_answers = encode_words(answers)
+        self.shape = (len(guesses), len(answers))
+        self.block_rows = block_rows
+        self.max_cache_bytes = max_cache_bytes
+        block_bytes = max(1, block_rows * len(answers))
+        self.max_cached_blocks = max(1, max_cache_bytes // block_bytes)
+        # Maps block number to array of codes, least recently used first
+        self.blocks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_block(self, block: int) -> np.ndarray:
+        codes = self.blocks.get(block)
+        if codes is not None:
+            self.hits += 1
+            self.blocks.move_to_end(block)
+            return codes
+        self.misses += 1
+        row_start = block * self.block_rows
+        codes = feedback_table(self.encoded_guesses[row_start:row_start + self.block_rows], self.encoded_answers)
+        self.blocks[block] = codes
+        if len(self.blocks) > self.max_cached_blocks:
+            self.blocks.popitem(last=False)
+        return codes
+
+    def row(self, guess_index: int) -> np.ndarray:
+        """
+        :return: pattern codes for one guess against every answer
+        """
+        if guess_index < 0:
+            guess_index += self.shape[0]
+        if not 0 <= guess_index < self.shape[0]:
+            raise IndexError(f"Guess index {guess_index} out of range")
+        block, offset = divmod(guess_index, self.block_rows)
+        return self._get_block(block)[offset]
+
+    def __getitem__(self, guess_index: int) -> np.ndarray:
+        return self.row(guess_index)
+
+    def __len__(self) -> int:
+        return self.shape[0]
@@ -1,7 +1,10 @@
-from typing import Tuple
+import time
+from typing import Tuple, Optional
 from enum import Enum
 from game_master import GameMaster
+from game_stats import feedback_pattern
 from lexicon import to_string
+from strategies import Strategy, HeuristicStrategy
 
 
 class GuessOutcomeCode(Enum):
@@ -23,10 +26,16 @@ class Player:
     or play automatically itself.
     """
 
-    def __init__(self, game_master: GameMaster, human_player: bool):
+    def __init__(self, game_master: GameMaster, human_player: bool, strategy: Optional[Strategy] = None):
         self.game_master = game_master
         self.automatic_play = not human_player
+        # How the AI picks its guesses, see strategies.py
+        self.strategy = strategy if strategy is not None else HeuristicStrategy()
         self.debug_mode = False
+        # If set to a GameStats, the AI player records every turn there
+        self.stats = None
+        # Candidate count left over from the previous turn, so it isn't computed twice
+        self._candidate_count = None
 
     def handle_guess(self) -> GuessOutcomeCode:
         """
@@ -38,6 +47,32 @@ class Player:
         else:
             return self._handle_human_guess()
 
+    def play_game(self, seed: Optional[int] = None) -> GuessOutcomeCode:
+        """
+        Resets the game master and plays a whole game.
+        :param seed: seed for the game, see GameMaster.reset()
+        :return: the outcome code of the final turn
+        """
+        self.game_master.reset(seed)
+        outcome_code = GuessOutcomeCode.UNDECIDED
+        while self.game_master.guesses_left > 0:
+            outcome_code = self.handle_guess()
+            if outcome_code.is_game_end():
+                break
+        return outcome_code
+
+    def record_game(self, outcome_code: GuessOutcomeCode, seed: Optional[int] = None):
+        """
+        Records a finished game in the player's stats, if it has any. A game that ran out of guesses
+        without a final outcome counts as a defeat.
+        :param outcome_code: outcome code of the final turn
+        :param seed: the game's seed
+        """
+        if self.stats is None:
+            return
+        outcome = outcome_code if outcome_code.is_game_end() else GuessOutcomeCode.DEFEAT
+        self.stats.record_game(outcome.name, self.game_master.get_score(), seed)
+
     def print_help(self):
         """
         Prints out the user manual.
@@ -100,35 +135,32 @@ class Player:
 
     def _handle_robot_guess(self) -> GuessOutcomeCode:
         """
-        Handles a guess by the AI player. The GameMaster implements a lot of the logic of the heuristic.
-        I supposed it makes more sense to be in this class, but oh well.
+        Handles a guess by the AI player, using its strategy to pick the word.
 
         :return: the outcome code
         """
         guess_num = self.game_master.total_guesses - self.game_master.guesses_left + 1
-        # Choose the strategy. This logic is somewhat arbitrary; I arrived at it via tweaks.
-        green_count = 0
-        for g in self.game_master.definite_letters:
-            if g is not None:
-                green_count += 1
-        ignore_greens = False
-        ignore_yellows = False
-        strategy_type = "hone in"
-        if (self.game_master.guesses_left > 4) or ((self.game_master.guesses_left > 2) and green_count < 2):
-            ignore_greens = True
-            strategy_type = "position yellows"
-            if len(self.game_master.misplaced_letters) < 2:
-                ignore_yellows = True
-                strategy_type = "untried letters"
-
-        usable_words = self.game_master.get_usable_words(ignore_greens=ignore_greens, ignore_yellows=ignore_yellows)
-        if len(usable_words) == 0:
+        candidates_before = 0
+        if self.stats is not None:
+            if guess_num == 1 or self._candidate_count is None:
+                self._candidate_count = len(self.game_master.get_usable_words())
+            candidates_before = self._candidate_count
+        start_time = time.perf_counter()
+        guess, strategy_type = self.strategy.choose_guess(self.game_master)
+        if guess is None:
             print(f"ERROR: no usable words, answer was {self.game_master.correct_word}")
             print("")
             self.game_master.print_data()
             return GuessOutcomeCode.ERROR
-        guess = self.game_master.select_usable_word(usable_words)
         success, gray_letters, yellow_letters, green_letters = self.game_master.handle_guess(guess)
+        if self.stats is not None:
+            elapsed = time.perf_counter() - start_time
+            if guess == self.game_master.correct_word:
+                self._candidate_count = 1
+            else:
+                self._candidate_count = len(self.game_master.get_usable_words())
+            self.stats.record_turn(strategy_type, guess_num, candidates_before, self._candidate_count, elapsed,
+                                   feedback_pattern(gray_letters, yellow_letters, green_letters))
         print(f"\nGuess was: {guess}. Turn {guess_num} of {self.game_master.total_guesses}. Strategy: {strategy_type}")
         if guess == self.game_master.correct_word:
             print(f"Victory!")
@@ -0,0 +1,46 @@
+import hashlib
+from random import Random
+from typing import Optional
+
+
+def new_seed() -> int:
+    """
+    Picks a fresh seed from system entropy, for runs where the user didn't ask for one.
+    The seed gets printed with the results, so the run can be repeated later.
+    :return: the seed
+    """
+    return Random().getrandbits(63)
+
+
+def derive_seed(seed: int, *keys) -> int:
+    """
+    Derives an independent seed from a base seed and any number of keys (game number,
+    worker number, etc). The same inputs always give the same output, on any machine and
+    in any process, so work can be split up without the random streams being correlated.
+    :param seed: the base seed
+    :param keys: anything with a stable str() representation
+    :return: the derived seed
+    """
+    text = ":".join(str(k) for k in (seed,) + keys)
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+def game_seed(seed: int, game_index: int) -> int:
+    """
+    Returns the seed for one game in a run. Since it depends only on the run seed and the
+    game's index, a game plays out the same no matter which worker or shard runs it.
+    :param seed: the seed for the whole run
+    :param game_index: the game's position in the run, starting at 0
+    :return: the game's seed
+    """
+    return derive_seed(seed, "game", game_index)
+
+
+def make_rng(seed: Optional[int] = None) -> Random:
+    """
+    Creates a private random number generator, seeded if a seed is given.
+    :param seed: the seed, or None to seed from system entropy
+    :return: the generator
+    """
+    return Random(seed)
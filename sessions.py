@@ -0,0 +1,282 @@
+"""
+Hosts many human games at once in one process, served as JSON over HTTP on localhost.
+
+Each session keeps only its answer and the guesses made so far. The full game state (green, yellow
+and gray letters, usable words, ...) is rebuilt when needed by replaying those guesses on a single
+GameMaster, which is cheap since a game has at most six guesses. The lexicon and word scores are
+GameMaster class attributes, shared by everything. So a session costs a few hundred bytes, and
+one process can hold thousands of them.
+
+Endpoints:
+    POST   /sessions               start a game, optional body {"seed": n}
+    GET    /sessions/<id>          the game so far
+    POST   /sessions/<id>/guess    body {"guess": "crane"}
+    GET    /sessions/<id>/hint     number of words still possible, and one of them
+    DELETE /sessions/<id>          end the game
+"""
+
+import asyncio
+import json
+import secrets
+import time
+from collections import OrderedDict
+from typing import Optional
+from game_master import GameMaster
+from game_stats import feedback_pattern
+from seeding import derive_seed, new_seed
+
+
+class Session:
+    """
+    One game in progress.
+    """
+    __slots__ = ("answer", "seed", "guesses", "last_used")
+
+    def __init__(self, answer: str, seed: int):
+        self.answer = answer
+        self.seed = seed
+        self.guesses = []
+        self.last_used = time.monotonic()
+
+    def is_won(self) -> bool:
+        return len(self.guesses) > 0 and self.guesses[-1] == self.answer
+
+
+class SessionManager:
+    """
+    Keeps track of sessions by id. Sessions that go unused for longer than the time to live are
+    evicted, and if there are too many sessions, the least recently used ones go first.
+    """
+
+    def __init__(self, ttl_seconds: float = 1800.0, max_sessions: int = 100000, seed: Optional[int] = None):
+        """
+        :param ttl_seconds: how long a session can go unused before it's evicted
+        :param max_sessions: the most sessions to hold at once
+        :param seed: if given, session n gets a seed derived from this, unless one is asked for
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.seed = seed
+        self.sessions_created = 0
+        # Maps session id to Session, least recently used first
+        self.sessions = OrderedDict()
+        # Used for replaying games. Everything runs on one event loop, so it's never shared.
+        self.game_master = GameMaster()
+        # For checking guesses, since the word list itself is slow to search
+        self.valid_words = set(GameMaster.word_list)
+
+    def create(self, seed: Optional[int] = None) -> str:
+        """
+        Starts a new game.
+        :param seed: seed for the game's answer word; chosen automatically if not given
+        :return: the session id
+        """
+        if seed is None:
+            seed = new_seed() if self.seed is None else derive_seed(self.seed, "session", self.sessions_created)
+        self.sessions_created += 1
+        self.game_master.reset(seed)
+        session_id = secrets.token_hex(8)
+        self.sessions[session_id] = Session(self.game_master.correct_word, seed)
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+        return session_id
+
+    def get(self, session_id: str) -> Session:
+        """
+        Looks up a session and marks it as used.
+        :raises KeyError: if there's no such session
+        """
+        session = self.sessions[session_id]
+        session.last_used = time.monotonic()
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str):
+        del self.sessions[session_id]
+
+    def evict_expired(self) -> int:
+        """
+        Removes sessions unused for longer than the time to live.
+        :return: number of sessions removed
+        """
+        cutoff = time.monotonic() - self.ttl_seconds
+        count = 0
+        while len(self.sessions) > 0:
+            session_id, session = next(iter(self.sessions.items()))
+            if session.last_used >= cutoff:
+                break
+            del self.sessions[session_id]
+            count += 1
+        return count
+
+    def _replay(self, session: Session) -> list:
+        """
+        Loads a session's game into the game master by replaying its guesses.
+        :return: list of the feedback patterns for the guesses, see feedback_pattern()
+        """
+        self.game_master.reset(session.seed)
+        self.game_master.correct_word = session.answer
+        patterns = []
+        for guess in session.guesses:
+            success, gray_letters, yellow_letters, green_letters = self.game_master.handle_guess(guess)
+            patterns.append(feedback_pattern(gray_letters, yellow_letters, green_letters))
+        return patterns
+
+    def _describe(self, session: Session) -> dict:
+        patterns = self._replay(session)
+        state = {
+            "guesses": [{"guess": guess, "pattern": pattern} for guess, pattern in zip(session.guesses, patterns)],
+            "guesses_left": self.game_master.guesses_left,
+            "status": "playing",
+        }
+        if session.is_won():
+            state["status"] = "won"
+        elif self.game_master.guesses_left <= 0:
+            state["status"] = "lost"
+        if state["status"] != "playing":
+            state["answer"] = session.answer
+        return state
+
+    def state(self, session_id: str) -> dict:
+        """
+        :return: the game so far, with the feedback for each guess
+        """
+        return self._describe(self.get(session_id))
+
+    def guess(self, session_id: str, guess: str) -> dict:
+        """
+        Makes a guess in a session's game.
+        :return: the game so far, as for state()
+        :raises KeyError: if there's no such session
+        :raises ValueError: if the game is over or the guess isn't a known word
+        """
+        session = self.get(session_id)
+        if session.is_won() or len(session.guesses) >= self.game_master.total_guesses:
+            raise ValueError("Game is over")
+        guess = guess.strip().lower()
+        if guess not in self.valid_words:
+            raise ValueError("Not a valid word!")
+        session.guesses.append(guess)
+        return self._describe(session)
+
+    def hint(self, session_id: str) -> dict:
+        """
+        :return: number of words that could still be the answer and, if there are more than five,
+        one of them, like GameMaster.get_hint()
+        """
+        session = self.get(session_id)
+        self._replay(session)
+        usable_words = self.game_master.get_usable_words()
+        hint = {"valid_choices": len(usable_words)}
+        if len(usable_words) > 5:
+            hint["hint"] = usable_words[self.game_master.rng.randrange(len(usable_words))]
+        return hint
+
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def _route(manager: SessionManager, method: str, path: str, body: dict) -> tuple:
+    """
+    Handles one request.
+    :return: tuple containing (HTTP status code, JSON-able response)
+    """
+    parts = [p for p in path.split("/") if p != ""]
+    if len(parts) == 0 or parts[0] != "sessions":
+        return 404, {"error": "Not found"}
+    try:
+        if len(parts) == 1:
+            if method != "POST":
+                return 405, {"error": "Method not allowed"}
+            seed = body.get("seed")
+            if seed is not None and not isinstance(seed, int):
+                return 400, {"error": "Seed must be an integer"}
+            session_id = manager.create(seed)
+            response = manager.state(session_id)
+            response["session"] = session_id
+            return 201, response
+        session_id = parts[1]
+        if len(parts) == 2 and method == "GET":
+            return 200, manager.state(session_id)
+        if len(parts) == 2 and method == "DELETE":
+            manager.delete(session_id)
+            return 200, {}
+        if len(parts) == 3 and parts[2] == "guess" and method == "POST":
+            guess = body.get("guess")
+            if not isinstance(guess, str):
+                return 400, {"error": "Missing guess"}
+            return 200, manager.guess(session_id, guess)
+        if len(parts) == 3 and parts[2] == "hint" and method == "GET":
+            return 200, manager.hint(session_id)
+        return 404, {"error": "Not found"}
+    except KeyError:
+        return 404, {"error": "No such session"}
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+
+async def _handle_connection(manager: SessionManager, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """
+    Serves HTTP/1.1 requests on one connection until the client closes it.
+    """
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            fields = request_line.decode("latin-1").split()
+            if len(fields) != 3:
+                break
+            method, path, version = fields
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            status = 400
+            response = {"error": "Bad request"}
+            try:
+                length = int(headers.get("content-length", "0"))
+                raw_body = await reader.readexactly(length) if length > 0 else b""
+                body = json.loads(raw_body) if len(raw_body) > 0 else {}
+                if isinstance(body, dict):
+                    status, response = _route(manager, method, path, body)
+            except ValueError:
+                pass
+
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            payload = json.dumps(response).encode("utf-8")
+            writer.write((f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                          f"Content-Type: application/json\r\n"
+                          f"Content-Length: {len(payload)}\r\n"
+                          f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1") + payload)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _evict_periodically(manager: SessionManager):
+    while True:
+        await asyncio.sleep(max(1.0, manager.ttl_seconds / 10.0))
+        manager.evict_expired()
+
+
+async def serve(manager: SessionManager, port: int, host: str = "127.0.0.1"):
+    """
+    Serves games until cancelled.
+    """
+    server = await asyncio.start_server(lambda r, w: _handle_connection(manager, r, w), host, port)
+    eviction_task = asyncio.ensure_future(_evict_periodically(manager))
+    print(f"Serving games on http://{host}:{port}/sessions")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        eviction_task.cancel()
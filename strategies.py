@@ -0,0 +1,118 @@
+from typing import Tuple, Optional
+from game_master import GameMaster
+
+
+class Strategy:
+    """
+    Base class for the AI's strategies. A strategy looks at the state of a game in progress and
+    picks the next guess. It doesn't make the guess itself; the Player does that.
+
+    To add a strategy, subclass this, give it a unique name, and decorate it with
+    @register_strategy so it can be chosen from the command line.
+    """
+    name = None
+
+    def choose_guess(self, game_master: GameMaster) -> Tuple[Optional[str], str]:
+        """
+        Picks the next guess.
+        :param game_master: the game in progress, with its record of green, yellow and gray letters
+        :return: tuple containing (the guess, or None if no usable word was found,
+        name of the phase of the strategy that picked it)
+        """
+        raise NotImplementedError
+
+
+# Maps strategy name to strategy class
+STRATEGIES = {}
+
+
+def register_strategy(strategy_class):
+    """
+    Class decorator that adds a strategy to the registry under its name.
+    """
+    if strategy_class.name in STRATEGIES:
+        raise ValueError(f"Strategy '{strategy_class.name}' already registered")
+    STRATEGIES[strategy_class.name] = strategy_class
+    return strategy_class
+
+
+def get_strategy(name: str) -> Strategy:
+    """
+    Creates a strategy by name.
+    :param name: the name the strategy was registered under
+    :return: a new instance of the strategy
+    """
+    strategy_class = STRATEGIES.get(name)
+    if strategy_class is None:
+        raise ValueError(f"Unknown strategy '{name}'. Choices are: {', '.join(STRATEGIES.keys())}")
+    return strategy_class()
+
+
+@register_strategy
+class HeuristicStrategy(Strategy):
+    """
+    The original heuristic. Early on, it tries words made of untried letters, then words that
+    move yellow letters to new places, and finally it hones in on the answer using the greens.
+    """
+    name = "heuristic"
+    # If True, words are scored by the letters of the words still in play, see GameMaster.select_usable_word()
+    live_scores = False
+
+    def choose_guess(self, game_master: GameMaster) -> Tuple[Optional[str], str]:
+        # Choose the strategy. This logic is somewhat arbitrary; I arrived at it via tweaks.
+        green_count = 0
+        for g in game_master.definite_letters:
+            if g is not None:
+                green_count += 1
+        ignore_greens = False
+        ignore_yellows = False
+        strategy_type = "hone in"
+        if (game_master.guesses_left > 4) or ((game_master.guesses_left > 2) and green_count < 2):
+            ignore_greens = True
+            strategy_type = "position yellows"
+            if len(game_master.misplaced_letters) < 2:
+                ignore_yellows = True
+                strategy_type = "untried letters"
+
+        usable_words = game_master.get_usable_words(ignore_greens=ignore_greens, ignore_yellows=ignore_yellows)
+        if len(usable_words) == 0:
+            return None, strategy_type
+        return game_master.select_usable_word(usable_words, live_scores=self.live_scores), strategy_type
+
+
+@register_strategy
+class LiveHeuristicStrategy(HeuristicStrategy):
+    """
+    The original heuristic, but scoring words by letter frequencies among the words that could
+    still be the answer, rather than among the whole lexicon.
+    """
+    name = "heuristic_live"
+    live_scores = True
+
+
+@register_strategy
+class HoneInStrategy(Strategy):
+    """
+    Always guesses a word that could be the answer, preferring high scoring ones.
+    """
+    name = "hone_in"
+
+    def choose_guess(self, game_master: GameMaster) -> Tuple[Optional[str], str]:
+        usable_words = game_master.get_usable_words()
+        if len(usable_words) == 0:
+            return None, "hone in"
+        return game_master.select_usable_word(usable_words), "hone in"
+
+
+@register_strategy
+class RandomStrategy(Strategy):
+    """
+    Guesses any word that could be the answer, ignoring scores. Useful as a baseline.
+    """
+    name = "random"
+
+    def choose_guess(self, game_master: GameMaster) -> Tuple[Optional[str], str]:
+        usable_words = game_master.get_usable_words()
+        if len(usable_words) == 0:
+            return None, "random"
+        return usable_words[game_master.rng.randrange(len(usable_words))], "random"
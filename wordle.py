@@ -1,58 +1,80 @@
 from typing import Tuple
 import argparse
-from lexicon import create_word_list, determine_word_scores, get_alphabet, hint_helper
+import asyncio
+from lexicon import create_word_list, determine_word_scores, get_alphabet, hint_helper, to_string
 from game_master import GameMaster
 from player import Player, GuessOutcomeCode
+from seeding import new_seed, game_seed
+from game_stats import GameStats
+from strategies import STRATEGIES, get_strategy
+from compare import compare_strategies, print_comparison
 
 game_master = GameMaster()
 player = Player(game_master, False)
 
 
-def run_game() -> Tuple[bool, GuessOutcomeCode, int]:
-    print("\nBeginning new game\n=======================")
-    game_master.reset()
-    outcome_code = GuessOutcomeCode.UNDECIDED
-    while game_master.guesses_left > 0:
-        outcome_code = player.handle_guess()
-        if outcome_code.is_game_end():
-            break
+def run_game(seed: int) -> Tuple[bool, GuessOutcomeCode, int]:
+    print(f"\nBeginning new game (seed {seed})\n=======================")
+    outcome_code = player.play_game(seed)
     score = game_master.get_score()
-    return game_master.guesses_left > 0, outcome_code, score
+    return outcome_code == GuessOutcomeCode.VICTORY, outcome_code, score
 
 
-def run_many_games(ai_mode, game_count, scoring_method, debug_mode):
+def run_many_games(ai_mode, game_count, scoring_method, debug_mode, seed, replay_seed=None, stats=None,
+                   strategy_name="heuristic"):
+    """
+    Plays a series of games and prints the results. Each game is seeded from the run seed and the
+    game's number, and the seeds of lost games are printed, so any one of them can be replayed
+    with --game_seed. If stats (a GameStats) is given, every AI turn and game is recorded in it.
+    """
     global game_master, player
     GameMaster.word_list = create_word_list()
     GameMaster.word_scores = determine_word_scores(game_master.word_list, scoring_method)
+    GameMaster.scoring_method = scoring_method
     GameMaster.alphabet = get_alphabet()
     game_master.reset()
     player.automatic_play = ai_mode
     player.debug_mode = debug_mode
+    player.stats = stats
+    player.strategy = get_strategy(strategy_name)
     player.print_help()
 
     victory_count = 0
     defeat_count = 0
     error_count = 0
     average_score = 0.0
+    lost_game_seeds = []
     for g in range(game_count):
-        victory, outcome_code, score = run_game()
+        this_game_seed = replay_seed if replay_seed is not None else game_seed(seed, g)
+        victory, outcome_code, score = run_game(this_game_seed)
         if outcome_code == GuessOutcomeCode.QUIT:
             print("Quitting.")
             break
-        elif outcome_code == GuessOutcomeCode.ERROR:
+        player.record_game(outcome_code, this_game_seed)
+        if outcome_code == GuessOutcomeCode.ERROR:
             error_count += 1
+            lost_game_seeds.append(this_game_seed)
         elif victory:
             victory_count += 1
-            average_score = (average_score * float(victory_count) + float(score)) / float(victory_count + 1)
+            average_score = (average_score * float(victory_count - 1) + float(score)) / float(victory_count)
         else:
             defeat_count += 1
+            lost_game_seeds.append(this_game_seed)
     print("\nResults:")
+    if replay_seed is not None:
+        print(f"Game seed:       {replay_seed}")
+    else:
+        print(f"Run seed:        {seed}")
     print(f"Total games:     {game_count}")
     print(f"Total victories: {victory_count}")
     print(f"Total defeats:   {defeat_count}")
     print(f"Total errors:    {error_count}")
     print(f"% victories      {(float(victory_count) / float(game_count)) * 100.0}")
     print(f"Average score:   {average_score}")
+    if len(lost_game_seeds) > 0:
+        print(f"Lost game seeds: {to_string(lost_game_seeds, True)}")
+    if stats is not None:
+        stats.print_summary()
 
 
 parser = argparse.ArgumentParser(description='Wordle Game and Solver', formatter_class=argparse.RawTextHelpFormatter)
@@ -82,6 +104,91 @@ parser.add_argument(
     default=1,
     help="Scoring method to use",
 )
+parser.add_argument(
+    "--seed",
+    type=int,
+    required=False,
+    default=None,
+    help="Seed for the run, making it reproducible. If omitted, one is chosen and printed",
+)
+parser.add_argument(
+    "--game_seed",
+    type=int,
+    required=False,
+    default=None,
+    help="Replay the single game with this seed (as printed at the start of each game)",
+)
+parser.add_argument(
+    "--stats",
+    required=False,
+    action="store_true",
+    help="Collect and print per-turn statistics for the AI",
+)
+parser.add_argument(
+    "--stats_csv",
+    type=str,
+    required=False,
+    default=None,
+    help="Write per-phase statistics to this CSV file (implies --stats)",
+)
+parser.add_argument(
+    "--stats_json",
+    type=str,
+    required=False,
+    default=None,
+    help="Write all statistics to this JSON file (implies --stats)",
+)
+parser.add_argument(
+    "--strategy",
+    type=str,
+    required=False,
+    default="heuristic",
+    choices=list(STRATEGIES.keys()),
+    help="Strategy for the AI to use",
+)
+parser.add_argument(
+    "--compare",
+    type=str,
+    required=False,
+    default=None,
+    help="Compare strategies head to head on the same games, e.g. --compare heuristic,hone_in",
+)
+parser.add_argument(
+    "--workers",
+    type=int,
+    required=False,
+    default=1,
+    help="Number of processes to use with --compare or --build_table",
+)
+parser.add_argument(
+    "--check_feedback",
+    required=False,
+    action="store_true",
+    help="Check the batched feedback code (feedback.py, needs NumPy) against the game, for every pair of words",
+)
+parser.add_argument(
+    "--build_table",
+    type=str,
+    required=False,
+    default=None,
+    help="Build the table of feedback patterns for every pair of words and save it to this .npy file\n"
+         "(needs NumPy; uses --workers)",
+)
+parser.add_argument(
+    "--serve",
+    type=int,
+    required=False,
+    default=None,
+    metavar="PORT",
+    help="Host games for many players at once over HTTP on localhost, see sessions.py",
+)
+parser.add_argument(
+    "--session_ttl",
+    type=float,
+    required=False,
+    default=1800.0,
+    help="With --serve, seconds a game can go unused before it's dropped",
+)
 parser.add_argument(
     "--hint",
     type=str,
@@ -95,18 +202,69 @@ parser.add_argument(
          "Anything after ':': a gray letter",
 )
 
-args = parser.parse_args()
+# Worker processes started by --compare may import this file, so only run when executed directly
+if __name__ == "__main__":
+    args = parser.parse_args()
 
-if args.hint is not None:
-    hint_helper(args.hint)
-    exit()
+    if args.hint is not None:
+        hint_helper(args.hint)
+        exit()
 
-num_games = args.games
-if num_games is None:
-    if args.ai:
-        num_games = 100
-    else:
+    if args.check_feedback:
+        # Imported here so that NumPy is only needed for this option
+        from feedback import check_against_game_master
+        GameMaster.word_list = create_word_list()
+        GameMaster.alphabet = get_alphabet()
+        mismatch_count = check_against_game_master(GameMaster.word_list)
+        print(f"Checked {len(GameMaster.word_list) ** 2} guess/answer pairs, {mismatch_count} mismatches")
+        exit()
+
+    if args.build_table is not None:
+        from pattern_table import build_pattern_table
+        word_list = create_word_list()
+        table = build_pattern_table(word_list, word_list, path=args.build_table, workers=args.workers)
+        print(f"Wrote {table.shape[0]}x{table.shape[1]} table to {args.build_table}")
+        exit()
+
+    num_games = args.games
+    if args.game_seed is not None:
         num_games = 1
+    elif num_games is None:
+        if args.ai or args.compare is not None:
+            num_games = 100
+        else:
+            num_games = 1
+
+    if args.serve is not None:
+        from sessions import SessionManager, serve
+        GameMaster.word_list = create_word_list()
+        GameMaster.word_scores = determine_word_scores(GameMaster.word_list, args.scoring_method)
+        GameMaster.alphabet = get_alphabet()
+        try:
+            asyncio.run(serve(SessionManager(args.session_ttl, seed=args.seed), args.serve))
+        except KeyboardInterrupt:
+            pass
+        exit()
 
-run_many_games(args.ai, num_games, args.scoring_method, args.debug)
+    run_seed = args.seed if args.seed is not None else new_seed()
+    if args.compare is not None:
+        print(f"Comparing strategies over {num_games} games (run seed {run_seed})")
+        try:
+            results = compare_strategies(args.compare.split(","), num_games, args.scoring_method, run_seed,
+                                         args.workers)
+        except ValueError as e:
+            parser.error(str(e))
+        print_comparison(results)
+        exit()
 
+    game_stats = None
+    if args.stats or args.stats_csv is not None or args.stats_json is not None:
+        # When replaying a single game, its seed ends up in the lost game seeds if it's lost again
+        game_stats = GameStats(run_seed if args.game_seed is None else None)
+    run_many_games(args.ai, num_games, args.scoring_method, args.debug, run_seed, args.game_seed, game_stats,
+                   args.strategy)
+    if game_stats is not None:
+        if args.stats_csv is not None:
+            game_stats.write_csv(args.stats_csv)
+        if args.stats_json is not None:
+            game_stats.write_json(args.stats_json)